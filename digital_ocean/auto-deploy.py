@@ -6,9 +6,14 @@ A robust, automated system for deploying and managing Tailscale exit nodes
 on DigitalOcean droplets using cloud-init for zero-touch deployment.
 """
 
-import json
+import hashlib
 import logging
+import logging.handlers
+import operator
 import os
+import queue
+import re
+import signal
 import sys
 import time
 import threading
@@ -20,9 +25,29 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union
 
 import digitalocean
+import orjson
 import requests
 import tenacity
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    parse_datetime = datetime.fromisoformat
+
+# Fast-path for dotted-quad IPv4; anything else falls back to ipaddress
+_IPV4_RE = re.compile(
+    r"\A(?:(?:25[0-5]|2[0-4]\d|[01]?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d?\d)\Z"
+)
+
+# Status endpoints served by the node's setup script on port 8080
+_SETUP_URL = "http://%s:8080/setup-complete"
+_TS_IP_URL = "http://%s:8080/tailscale-ip.txt"
+_TS_STATUS_URL = "http://%s:8080/tailscale-status.json"
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__ instances
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # Custom Exceptions
@@ -47,7 +72,7 @@ class ConfigurationError(TailscaleExitNodeError):
 
 
 # Configuration
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Config:
     """Application configuration."""
     do_token: str
@@ -68,7 +93,8 @@ class Config:
         if not self.ts_authkey:
             raise ConfigurationError("TS_AUTHKEY is required")
         if self.target_nodes > self.max_nodes:
-            raise ConfigurationError("target_nodes cannot exceed max_nodes")    
+            raise ConfigurationError("target_nodes cannot exceed max_nodes")
+
     @classmethod
     def from_env(cls) -> 'Config':
         """Create configuration from environment variables."""
@@ -88,14 +114,19 @@ class Config:
 
 
 # Logging Setup
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging(config: Config) -> logging.Logger:
-    """Setup structured logging with file and console handlers."""
+    """Setup structured logging with file and console handlers fed by a background queue listener."""
+    global _log_listener
     logger = logging.getLogger("tailscale_autodeploy")
     logger.setLevel(getattr(logging, config.log_level.upper()))
     
     # Clear existing handlers
     if logger.hasHandlers():
         logger.handlers.clear()
+    shutdown_logging()
     
     # Create formatter
     formatter = logging.Formatter(
@@ -106,17 +137,31 @@ def setup_logging(config: Config) -> logging.Logger:
     log_file = Path("auto-deploy.log")
     file_handler = logging.FileHandler(log_file)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Queue handler feeding the background listener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
     
     return logger
 
 
-@dataclass
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ExitNodeInfo:
     """Information about a Tailscale exit node."""
     droplet_id: str
@@ -138,12 +183,12 @@ class ExitNodeInfo:
             tailscale_ip=data['tailscale_ip'],
             region=data['region'],
             status=data['status'],
-            created_at=datetime.fromisoformat(data['created_at']),
-            last_checked=datetime.fromisoformat(data['last_checked'])
+            created_at=parse_datetime(data['created_at']),
+            last_checked=parse_datetime(data['last_checked'])
         )
 
     def to_dict(self) -> Dict:
-        """Convert ExitNodeInfo to dictionary with datetime serialization."""
+        """Convert ExitNodeInfo to dictionary; datetimes are left for orjson to serialize."""
         return {
             'droplet_id': self.droplet_id,
             'name': self.name,
@@ -151,18 +196,25 @@ class ExitNodeInfo:
             'tailscale_ip': self.tailscale_ip,
             'region': self.region,
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'last_checked': self.last_checked.isoformat()
+            'created_at': self.created_at,
+            'last_checked': self.last_checked
         }
 
 
+_DEFAULT_SHELLS_PATH = Path(__file__).parent.parent / "shells"
+
+
 class CloudInitScriptGenerator:
     """Generates cloud-init scripts for Tailscale setup."""
     
     def __init__(self, shells_path: Optional[Union[str, Path]] = None):
         """Initialize with path to shells directory."""
-        base_path = Path(__file__).parent.parent
-        self.shells_path = Path(shells_path) if shells_path else base_path / "shells"
+        if not shells_path:
+            self.shells_path = _DEFAULT_SHELLS_PATH
+        elif isinstance(shells_path, Path):
+            self.shells_path = shells_path
+        else:
+            self.shells_path = Path(shells_path)
         
         self.setup_script_path = self.shells_path / "tailscale-exit-node-setup.bash"
         self.cloud_init_wrapper_path = self.shells_path / "cloud-init-wrapper.bash"
@@ -172,16 +224,20 @@ class CloudInitScriptGenerator:
         if not self.cloud_init_wrapper_path.exists():
             raise FileNotFoundError(f"Cloud-init wrapper script not found: {self.cloud_init_wrapper_path}")
 
+        # Scripts don't change during a run, so read them once and embed the
+        # setup script up front; only the per-node credentials vary per call
+        self.setup_script_content = self.setup_script_path.read_text()
+        self.wrapper_template = self.cloud_init_wrapper_path.read_text().replace(
+            "{setup_script_content}", self.setup_script_content
+        )
+
     def generate_tailscale_script(self, ts_authkey: str, login_server: str) -> str:
         """Generate cloud-init script using external wrapper and setup scripts."""
-        setup_script_content = self.setup_script_path.read_text()
-        cloud_init_wrapper_content = self.cloud_init_wrapper_path.read_text()
-        
-        # Replace placeholders in the wrapper script
-        return cloud_init_wrapper_content.format(
-            ts_authkey=ts_authkey,
-            login_server=login_server,
-            setup_script_content=setup_script_content
+        # Plain replacement leaves any braces in the embedded bash untouched
+        return (
+            self.wrapper_template
+            .replace("{ts_authkey}", ts_authkey)
+            .replace("{login_server}", login_server)
         )
 
 
@@ -244,17 +300,27 @@ class TailscaleExitNodeManager:
         self.do_client = DigitalOceanClient(config.do_token, logger)
         self.cloud_init_generator = CloudInitScriptGenerator()
         self.lock = threading.Lock()
+        self.shutdown_requested = False
+        self._shutdown_event = threading.Event()
+        self.http_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="HttpWorker")
+        
+        # Reuse pooled keep-alive connections for node HTTP checks
+        self.http = requests.Session()
+        self.http.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0))
         
         self.droplets: List[digitalocean.Droplet] = []
         self.regions: List[digitalocean.Region] = []
         self.sizes: List[digitalocean.Size] = []
         self.images: List[digitalocean.Image] = []
         self.region: Optional[digitalocean.Region] = None
+        self.image: Optional[digitalocean.Image] = None
         self.size: Optional[digitalocean.Size] = None
+        self._regions_by_slug: Dict[str, digitalocean.Region] = {}
 
         self._init_do_resources()
         
         self.exit_nodes_file = Path("exit_nodes.json")
+        self._last_saved_digest: bytes = b""
         self.exit_nodes: List[ExitNodeInfo] = self._load_exit_nodes()
 
     def _init_do_resources(self) -> None:
@@ -264,11 +330,12 @@ class TailscaleExitNodeManager:
             self.regions = self.do_client.get_regions()
             self.sizes = self.do_client.get_sizes()
             self.images = self.do_client.get_images()
+            self._regions_by_slug = {r.slug: r for r in self.regions}
             
             self.logger.info(f"Initialized with {len(self.droplets)} droplets from DigitalOcean account.")
             
             self.region = self._find_region(self.config.region)
-            self._validate_image_availability()
+            self.image = self._validate_image_availability()
             self.size = self._select_optimal_size()
             
         except Exception as e:
@@ -277,37 +344,39 @@ class TailscaleExitNodeManager:
 
     def _find_region(self, region_slug: str) -> digitalocean.Region:
         """Find and validate the specified region."""
-        for r in self.regions:
-            if r.slug == region_slug:
-                return r
-        available_slugs = [r.slug for r in self.regions]
-        raise ConfigurationError(f"Region '{region_slug}' not found. Available: {available_slugs}")
-
-    def _validate_image_availability(self) -> None:
-        """Validate that the specified image exists."""
-        if not any(self.config.image_name in image.slug for image in self.images if image.slug):
+        region = self._regions_by_slug.get(region_slug)
+        if region is None:
+            available_slugs = list(self._regions_by_slug)
+            raise ConfigurationError(f"Region '{region_slug}' not found. Available: {available_slugs}")
+        return region
+
+    def _validate_image_availability(self) -> digitalocean.Image:
+        """Validate that the specified image exists and return it."""
+        image = next((img for img in self.images if img.slug and self.config.image_name in img.slug), None)
+        if image is None:
             available_images = [img.slug for img in self.images if img.slug]
             raise ConfigurationError(
                 f"Image slug containing '{self.config.image_name}' not found. "
                 f"Check DO_IMAGE. Available image slugs (sample): {available_images[:5]}"
             )
+        return image
 
     def _select_optimal_size(self) -> digitalocean.Size:
         """Select the cheapest size that meets minimum requirements in the target region."""
         if not self.region:
             raise ConfigurationError("Region not initialized, cannot select size.")
 
-        valid_sizes = [
+        valid_sizes = (
             s for s in self.sizes 
             if (self.region.slug in s.regions and 
                 s.memory >= 1000 and
                 s.price_monthly is not None)
-        ]
+        )
+        selected_size = min(valid_sizes, key=operator.attrgetter("price_monthly"), default=None)
         
-        if not valid_sizes:
+        if selected_size is None:
             raise ConfigurationError(f"No suitable size (>=1GB RAM) found in region {self.region.slug}")
             
-        selected_size = min(valid_sizes, key=lambda x: x.price_monthly)
         self.logger.info(f"Selected optimal size: {selected_size.slug} (${selected_size.price_monthly}/month)")
         return selected_size
 
@@ -315,21 +384,29 @@ class TailscaleExitNodeManager:
         """Load exit nodes info from JSON file"""
         if self.exit_nodes_file.exists():
             try:
-                with open(self.exit_nodes_file, 'r') as f:
-                    data = json.load(f)
+                data = orjson.loads(self.exit_nodes_file.read_bytes())
                 return [ExitNodeInfo.from_dict(node_data) for node_data in data]
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 self.logger.warning(f"Error decoding JSON from {self.exit_nodes_file}: {e}. Starting with empty list.")
             except Exception as e:
                 self.logger.warning(f"Failed to load or parse {self.exit_nodes_file}: {e}. Starting with empty list.")
         return []
 
     def _save_exit_nodes(self):
-        """Save exit nodes info to JSON file"""
+        """Save exit nodes info to JSON file, skipping the write if nothing changed"""
         try:
             data_to_save = [node.to_dict() for node in self.exit_nodes]
-            with open(self.exit_nodes_file, 'w') as f:
-                json.dump(data_to_save, f, indent=2)
+            buf = orjson.dumps(data_to_save, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC)
+            digest = hashlib.blake2b(buf, digest_size=16).digest()
+            if digest == self._last_saved_digest:
+                self.logger.debug(f"Exit nodes unchanged, skipping write to {self.exit_nodes_file}")
+                return
+            
+            # Write to a temp file and swap it in so an interrupted save can't truncate state
+            tmp_file = self.exit_nodes_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(buf)
+            os.replace(tmp_file, self.exit_nodes_file)
+            self._last_saved_digest = digest
             self.logger.debug(f"Saved {len(data_to_save)} exit nodes to {self.exit_nodes_file}")
         except Exception as e:
             self.logger.error(f"Failed to save exit nodes to {self.exit_nodes_file}: {e}")
@@ -341,7 +418,8 @@ class TailscaleExitNodeManager:
             return None
         
         try:
-            ipaddress.ip_address(droplet.ip_address)
+            if not _IPV4_RE.match(droplet.ip_address):
+                ipaddress.ip_address(droplet.ip_address)
             status_info = self._get_status_via_http(droplet.ip_address)
             
             return {
@@ -360,15 +438,20 @@ class TailscaleExitNodeManager:
     def _get_status_via_http(self, ip: str) -> Dict:
         """Get status via HTTP endpoints."""
         try:
-            setup_response = requests.get(f"http://{ip}:8080/setup-complete", timeout=10)
+            # Cheap readiness probe first; http.server answers HEAD without sending the body
+            setup_response = self.http.head(_SETUP_URL % ip, timeout=2)
             if setup_response.status_code != 200:
                 self.logger.debug(f"HTTP: {ip}:8080/setup-complete returned {setup_response.status_code}")
                 return {'is_ready': False}
             
-            ts_ip_response = requests.get(f"http://{ip}:8080/tailscale-ip.txt", timeout=5)
+            # Fetch the Tailscale IP and status concurrently once the node reports ready
+            ts_ip_future = self.http_executor.submit(self.http.get, _TS_IP_URL % ip, timeout=5)
+            ts_status_future = self.http_executor.submit(self.http.get, _TS_STATUS_URL % ip, timeout=5)
+            
+            ts_ip_response = ts_ip_future.result()
             ts_ip = ts_ip_response.text.strip() if ts_ip_response.status_code == 200 else ""
             
-            ts_status_response = requests.get(f"http://{ip}:8080/tailscale-status.json", timeout=5)
+            ts_status_response = ts_status_future.result()
             ts_status_data = ts_status_response.json() if ts_status_response.status_code == 200 else {}
             
             return {
@@ -378,7 +461,9 @@ class TailscaleExitNodeManager:
             }
         except requests.RequestException as e:
             self.logger.debug(f"HTTP status check failed for {ip}: {e}")
-            return {'is_ready': False}    @tenacity.retry(
+            return {'is_ready': False}
+
+    @tenacity.retry(
         retry=tenacity.retry_if_exception_type(Exception),
         wait=tenacity.wait_exponential(multiplier=1, min=5, max=60),
         stop=tenacity.stop_after_attempt(3),
@@ -393,7 +478,7 @@ class TailscaleExitNodeManager:
             self.config.login_server
         )
 
-        image_obj = next((img for img in self.images if self.config.image_name in img.slug and img.slug is not None), None)
+        image_obj = self.image
         if not image_obj:
             raise DropletCreationError(f"Image slug containing '{self.config.image_name}' not found or has no ID.")
 
@@ -413,27 +498,45 @@ class TailscaleExitNodeManager:
         droplet.create()
         self.logger.info(f"Droplet creation initiated for {droplet_name} (Action ID: {droplet.action_ids[-1] if droplet.action_ids else 'N/A'})")
         
-        # Wait for creation to complete
-        action = self.do_client.get_action(droplet.action_ids[-1])
-        action.wait(update_every_seconds=10)
-        
-        # Refresh droplet object to get IP and full status
-        created_droplet = self.do_client.get_droplet(droplet.id)
-        if not created_droplet.ip_address:
-            raise DropletCreationError(f"Droplet {created_droplet.name} created but no IP address was assigned.")
+        try:
+            # Wait for creation to complete
+            action = self.do_client.get_action(droplet.action_ids[-1])
+            action.wait(update_every_seconds=10)
             
-        self.logger.info(f"Droplet {created_droplet.name} created successfully with IP: {created_droplet.ip_address}")
-        return created_droplet@tenacity.retry(
+            # Refresh droplet in place to get IP and full status; networking can lag the create action
+            for attempt in range(3):
+                droplet.load()
+                if droplet.ip_address:
+                    break
+                if attempt < 2:
+                    time.sleep(2)
+            else:
+                raise DropletCreationError(f"Droplet {droplet.name} created but no IP address was assigned.")
+        except Exception:
+            # The caller never sees this droplet, so destroy it before a retry creates another
+            try:
+                self.logger.warning(f"Destroying droplet {droplet_name} (ID: {droplet.id}) after failed creation")
+                droplet.destroy()
+            except Exception as cleanup_error:
+                self.logger.error(f"Failed to destroy droplet {droplet_name} (ID: {droplet.id}): {cleanup_error}")
+            raise
+            
+        self.logger.info(f"Droplet {droplet.name} created successfully with IP: {droplet.ip_address}")
+        return droplet
+
+    @tenacity.retry(
         retry=tenacity.retry_if_exception_type(NodeHealthCheckError),
-        wait=tenacity.wait_fixed(30),
-        stop=tenacity.stop_after_attempt(10),
+        # Probe quickly around the typical cloud-init completion time, with jitter
+        # so nodes provisioned together don't poll in lockstep
+        wait=tenacity.wait_exponential(multiplier=2, min=3, max=30) + tenacity.wait_random(0, 2),
+        stop=tenacity.stop_after_delay(300),
         before_sleep=tenacity.before_sleep_log(logging.getLogger("tailscale_autodeploy"), logging.INFO)
     )
-    def _wait_for_http_ready(self, ip: str, timeout_per_attempt: int = 20) -> bool:
+    def _wait_for_http_ready(self, ip: str, timeout_per_attempt: int = 5) -> bool:
         """Wait for HTTP endpoint on the droplet to become responsive."""
         self.logger.info(f"Waiting for HTTP service on {ip}:8080 to be ready...")
         try:
-            response = requests.get(f"http://{ip}:8080/setup-complete", timeout=timeout_per_attempt)
+            response = self.http.head(_SETUP_URL % ip, timeout=timeout_per_attempt)
             if response.status_code == 200:
                 self.logger.info(f"HTTP service on {ip}:8080 is ready!")
                 return True
@@ -457,6 +560,7 @@ class TailscaleExitNodeManager:
             if not node_status_data or not node_status_data.get('is_reachable'):
                 raise NodeHealthCheckError(f"Node {droplet.name} failed post-provisioning health check.")
             
+            now = datetime.now(timezone.utc)
             return ExitNodeInfo(
                 droplet_id=str(droplet.id),
                 name=droplet.name,
@@ -464,8 +568,8 @@ class TailscaleExitNodeManager:
                 tailscale_ip=node_status_data.get('tailscale_ip', "unknown"),
                 region=self.region.slug,
                 status='healthy',
-                created_at=datetime.now(timezone.utc),
-                last_checked=datetime.now(timezone.utc)
+                created_at=now,
+                last_checked=now
             )
         except Exception as e:
             self.logger.error(f"Failed to provision node: {e}")
@@ -481,7 +585,7 @@ class TailscaleExitNodeManager:
     def _provision_nodes(self, count: int) -> None:
         """Provision multiple nodes."""
         successful_nodes: List[ExitNodeInfo] = []
-        with ThreadPoolExecutor(max_workers=min(count, 3), thread_name_prefix="ProvisionWorker") as executor:
+        with ThreadPoolExecutor(max_workers=min(count, 8), thread_name_prefix="ProvisionWorker") as executor:
             futures = {executor.submit(self._provision_single_node): i for i, _ in enumerate(range(count))}
             
             for future in as_completed(futures):
@@ -497,41 +601,55 @@ class TailscaleExitNodeManager:
         if successful_nodes:
             with self.lock:
                 self.exit_nodes.extend(successful_nodes)
-    def _check_existing_nodes(self) -> List[ExitNodeInfo]:
-        """Check health of existing nodes."""
+
+    def _check_single_node(self, node_info: ExitNodeInfo, droplet: digitalocean.Droplet, now: datetime) -> Optional[ExitNodeInfo]:
+        """Health check a single tracked node. Returns the node if it is healthy."""
+        try:
+            if droplet.status == 'active':
+                node_status_data = self._get_node_status(droplet)
+                if node_status_data and node_status_data.get('is_reachable'):
+                    node_info.status = 'healthy'
+                    node_info.tailscale_ip = node_status_data.get('tailscale_ip', node_info.tailscale_ip)
+                    node_info.last_checked = now
+                    self.logger.debug(f"Node {node_info.name} health check PASSED")
+                    return node_info
+                else:
+                    node_info.status = 'unhealthy'
+                    node_info.last_checked = now
+                    self.logger.warning(f"Node {node_info.name} health check FAILED")
+            else:
+                node_info.status = 'unhealthy'
+                self.logger.warning(f"Node {node_info.name} (ID: {node_info.droplet_id}) found in DigitalOcean but status is '{droplet.status}'. Marked unhealthy.")
+        
+        except Exception as e:
+            self.logger.error(f"Error during health check for node {node_info.name} (ID: {node_info.droplet_id}): {e}. Marked as error.")
+            node_info.status = 'error'
+        return None
+
+    def _check_existing_nodes(self, now: Optional[datetime] = None) -> List[ExitNodeInfo]:
+        """Check health of existing nodes, stamping them with the cycle time."""
+        now = now or datetime.now(timezone.utc)
         healthy_nodes: List[ExitNodeInfo] = []
         current_do_droplets = {str(d.id): d for d in self.do_client.get_droplets()}
 
         nodes_to_remove_from_tracking = []
+        nodes_to_check: List[ExitNodeInfo] = []
 
         for node_info in self.exit_nodes:
-            try:
-                if node_info.droplet_id not in current_do_droplets:
-                    self.logger.warning(f"Node {node_info.name} (ID: {node_info.droplet_id}) tracked but not found in DigitalOcean. Marking for removal from tracking.")
-                    nodes_to_remove_from_tracking.append(node_info)
-                    continue
-
-                droplet = current_do_droplets[node_info.droplet_id]
-                
-                if droplet.status == 'active':
-                    node_status_data = self._get_node_status(droplet)
-                    if node_status_data and node_status_data.get('is_reachable'):
-                        node_info.status = 'healthy'
-                        node_info.tailscale_ip = node_status_data.get('tailscale_ip', node_info.tailscale_ip)
-                        node_info.last_checked = datetime.now(timezone.utc)
-                        healthy_nodes.append(node_info)
-                        self.logger.debug(f"Node {node_info.name} health check PASSED")
-                    else:
-                        node_info.status = 'unhealthy'
-                        node_info.last_checked = datetime.now(timezone.utc)
-                        self.logger.warning(f"Node {node_info.name} health check FAILED")
-                else:
-                    node_info.status = 'unhealthy'
-                    self.logger.warning(f"Node {node_info.name} (ID: {node_info.droplet_id}) found in DigitalOcean but status is '{droplet.status}'. Marked unhealthy.")
-            
-            except Exception as e:
-                self.logger.error(f"Error during health check for node {node_info.name} (ID: {node_info.droplet_id}): {e}. Marked as error.")
-                node_info.status = 'error'
+            if node_info.droplet_id not in current_do_droplets:
+                self.logger.warning(f"Node {node_info.name} (ID: {node_info.droplet_id}) tracked but not found in DigitalOcean. Marking for removal from tracking.")
+                nodes_to_remove_from_tracking.append(node_info)
+            else:
+                nodes_to_check.append(node_info)
+
+        # Health checks are network-bound, so run them side by side
+        if nodes_to_check:
+            with ThreadPoolExecutor(max_workers=min(16, len(nodes_to_check)), thread_name_prefix="HealthCheck") as executor:
+                results = executor.map(
+                    lambda node: self._check_single_node(node, current_do_droplets[node.droplet_id], now),
+                    nodes_to_check
+                )
+                healthy_nodes = [node for node in results if node]
 
         # Remove nodes that are tracked but no longer exist on DO
         if nodes_to_remove_from_tracking:
@@ -545,12 +663,18 @@ class TailscaleExitNodeManager:
     def _cleanup_failed_nodes(self) -> None:
         """Clean up unhealthy or failed nodes."""
         nodes_to_permanently_remove: List[ExitNodeInfo] = []
+        # Served from the droplets cache refreshed by _check_existing_nodes
+        current_do_droplets = {str(d.id): d for d in self.do_client.get_droplets()}
         
         for node_info in self.exit_nodes:
             if node_info.status in ['unhealthy', 'error']:
                 self.logger.warning(f"Node {node_info.name} (ID: {node_info.droplet_id}) is in status '{node_info.status}'. Evaluating for cleanup.")
+                droplet = current_do_droplets.get(node_info.droplet_id)
+                if droplet is None:
+                    self.logger.info(f"Droplet {node_info.name} (ID: {node_info.droplet_id}) no longer exists in DigitalOcean, skipping destroy")
+                    nodes_to_permanently_remove.append(node_info)
+                    continue
                 try:
-                    droplet = self.do_client.get_droplet(node_info.droplet_id)
                     self.logger.info(f"Destroying droplet {droplet.name} (ID: {droplet.id}) due to failed health checks")
                     droplet.destroy()
                     self.logger.info(f"Successfully destroyed droplet {droplet.name}")
@@ -565,17 +689,31 @@ class TailscaleExitNodeManager:
                     self.exit_nodes.remove(node)
                 self.logger.info(f"Removed {len(nodes_to_permanently_remove)} failed nodes from tracking")
 
+    def _signal_handler(self, signum: int, frame) -> None:
+        """Request a graceful shutdown of the management loop."""
+        self.logger.info(f"Received signal {signal.Signals(signum).name}, shutting down after current cycle...")
+        self.shutdown_requested = True
+        self._shutdown_event.set()
+        
+        # A cycle can block for minutes while provisioning; let a second signal exit immediately
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
     def run(self) -> None:
         """Main run loop for continuous operation."""
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        signal.signal(signal.SIGINT, self._signal_handler)
+        
         self.logger.info("Starting Tailscale exit node auto-deployment manager...")
         self.logger.info(f"Configuration: Target nodes: {self.config.target_nodes}, Max nodes: {self.config.max_nodes}, Health check interval: {self.config.health_check_interval}s")
         
-        while True:
+        while not self.shutdown_requested:
             try:
                 self.logger.info("Starting management cycle...")
+                cycle_started_at = datetime.now(timezone.utc)
                 
                 # Check existing nodes
-                healthy_nodes = self._check_existing_nodes()
+                healthy_nodes = self._check_existing_nodes(now=cycle_started_at)
                 self.logger.info(f"Found {len(healthy_nodes)} healthy nodes out of {len(self.exit_nodes)} tracked nodes")
                 
                 # Clean up failed nodes
@@ -604,13 +742,15 @@ class TailscaleExitNodeManager:
                 
                 self.logger.info(f"Management cycle complete. Sleeping for {self.config.health_check_interval} seconds...")
                 
-                # Sleep between cycles
-                time.sleep(self.config.health_check_interval)
+                # Sleep between cycles, waking immediately on shutdown
+                self._shutdown_event.wait(self.config.health_check_interval)
                     
             except Exception as e:
                 self.logger.error(f"Unhandled error in management loop: {e}", exc_info=True)
                 self.logger.info("Sleeping for 60 seconds due to error before retrying cycle.")
-                time.sleep(60)
+                self._shutdown_event.wait(60)
+        
+        self.logger.info("Management loop stopped.")
 
 
 def main() -> None:
@@ -637,6 +777,8 @@ def main() -> None:
         else:
             print(f"CRITICAL Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        shutdown_logging()
 
 
 if __name__ == "__main__":
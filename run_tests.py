@@ -6,19 +6,61 @@ This script provides easy commands to run different types of tests.
 """
 
 import argparse
+import os
+import re
 import subprocess
 import sys
+from importlib import metadata
 from pathlib import Path
 
+PYTEST_PREFIX = ["python", "-m", "pytest"]
+REQUIREMENT_RE = re.compile(r"^([A-Za-z0-9._-]+)\s*(==|>=)\s*([0-9][0-9.]*)\s*(?:#.*)?$")
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
+
+def _version_tuple(version):
+    """Turn a version string into a comparable tuple of its leading numeric parts."""
+    parts = []
+    for part in version.split("."):
+        match = re.match(r"\d+", part)
+        if not match:
+            break
+        parts.append(int(match.group()))
+    return tuple(parts)
+
+
+def requirements_satisfied(requirements_file):
+    """Check pkg==x.y / pkg>=x.y requirements against installed packages; anything else defers to pip."""
+    for line in Path(requirements_file).read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = REQUIREMENT_RE.match(line)
+        if not match:
+            return False
+        name, op, wanted = match.groups()
+        try:
+            installed = _version_tuple(metadata.version(name))
+        except metadata.PackageNotFoundError:
+            return False
+        wanted = _version_tuple(wanted)
+        if (op == "==" and installed != wanted) or (op == ">=" and installed < wanted):
+            return False
+    return True
+
+
+def run_command(cmd, description, in_process=False):
+    """Run a command and handle errors; pytest commands can run in-process via pytest.main()."""
     print(f"\n🔧 {description}")
     print(f"Running: {' '.join(cmd)}")
     print("-" * 50)
     
-    result = subprocess.run(cmd, cwd=Path(__file__).parent)
-    if result.returncode != 0:
+    if in_process and cmd[:len(PYTEST_PREFIX)] == PYTEST_PREFIX:
+        import pytest
+        os.chdir(Path(__file__).parent)
+        returncode = pytest.main(cmd[len(PYTEST_PREFIX):])
+    else:
+        returncode = subprocess.run(cmd, cwd=Path(__file__).parent).returncode
+    if returncode != 0:
         print(f"❌ {description} failed!")
         return False
     else:
@@ -30,7 +72,7 @@ def main():
     parser = argparse.ArgumentParser(description="Test runner for Tailscale auto-deployment")
     parser.add_argument(
         "command",
-        choices=["unit", "integration", "all", "coverage", "fast", "install-deps"],
+        choices=["unit", "integration", "all", "coverage", "fast", "testmon", "clear-cache", "install-deps"],
         help="Type of tests to run"
     )
     parser.add_argument(
@@ -38,37 +80,59 @@ def main():
         action="store_true",
         help="Run tests with verbose output"
     )
+    parser.add_argument(
+        "--workers", "-n",
+        default="auto",
+        help="Number of pytest-xdist workers (default: auto, one per CPU; 0 disables)"
+    )
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Run pytest in a separate interpreter instead of in-process"
+    )
     
     args = parser.parse_args()
     
-    base_cmd = ["python", "-m", "pytest"]
+    base_cmd = PYTEST_PREFIX + ["-n", str(args.workers)]
+    if str(args.workers) != "0":
+        # Keep tests from the same class/module on one worker so they share fixtures
+        base_cmd.append("--dist=loadscope")
+    in_process = not args.subprocess
     if args.verbose:
         base_cmd.append("-v")
     
     success = True
     
     if args.command == "install-deps":
-        success = run_command(
-            ["pip", "install", "-r", "tests/requirements.txt"],
-            "Installing test dependencies"
-        )
+        requirements_file = Path(__file__).parent / "tests" / "requirements.txt"
+        if requirements_satisfied(requirements_file):
+            print("✅ Test dependencies already installed")
+        else:
+            success = run_command(
+                ["pip", "install", "-r", "tests/requirements.txt"],
+                "Installing test dependencies"
+            )
     
     elif args.command == "unit":
         success = run_command(
             base_cmd + ["tests/", "-m", "unit"],
-            "Running unit tests"
+            "Running unit tests",
+            in_process=in_process
         )
     
     elif args.command == "integration":
         success = run_command(
             base_cmd + ["tests/", "-m", "integration"],
-            "Running integration tests"
+            "Running integration tests",
+            in_process=in_process
         )
     
     elif args.command == "fast":
         success = run_command(
-            base_cmd + ["tests/", "-m", "not slow"],
-            "Running fast tests (excluding slow tests)"
+            # Rerun only last-failed tests; fall back to the full fast set when none failed
+            base_cmd + ["tests/", "-m", "not slow", "--lf", "--lfnf=all"],
+            "Running fast tests (excluding slow tests)",
+            in_process=in_process
         )
     
     elif args.command == "coverage":
@@ -79,15 +143,35 @@ def main():
                 "--cov-report=html",
                 "--cov-report=term-missing"
             ],
-            "Running tests with coverage"
+            "Running tests with coverage",
+            in_process=in_process
         )
         if success:
             print("\n📊 Coverage report generated in htmlcov/index.html")
     
+    elif args.command == "testmon":
+        # testmon tracks per-test coverage itself and does not support xdist workers
+        testmon_cmd = PYTEST_PREFIX + ["--testmon", "tests/"]
+        if args.verbose:
+            testmon_cmd.append("-v")
+        success = run_command(
+            testmon_cmd,
+            "Running tests affected by changes since the last run (pytest-testmon)",
+            in_process=in_process
+        )
+    
+    elif args.command == "clear-cache":
+        success = run_command(
+            base_cmd + ["tests/", "--cache-clear"],
+            "Running all tests with a cleared pytest cache",
+            in_process=in_process
+        )
+    
     elif args.command == "all":
         success = run_command(
             base_cmd + ["tests/"],
-            "Running all tests"
+            "Running all tests",
+            in_process=in_process
         )
     
     if not success:
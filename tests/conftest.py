@@ -3,20 +3,12 @@ Shared pytest configuration and fixtures for the test suite.
 """
 
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import patch
+import shutil
+from types import MappingProxyType
 
 
-@pytest.fixture
-def temp_shells_dir():
-    """Create a temporary shells directory with test files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        shells_path = Path(temp_dir) / "shells"
-        shells_path.mkdir()
-        
-        # Create mock setup script
-        setup_script_content = """#!/bin/bash
+# Mock shell scripts, pre-encoded once at import
+_SETUP_SCRIPT_BYTES = """#!/bin/bash
 # Mock Tailscale setup script for testing
 set -euo pipefail
 
@@ -33,12 +25,9 @@ sysctl -p
 
 tailscale up --authkey="${TS_AUTHKEY}" --advertise-exit-node
 echo "Setup completed successfully!"
-"""
-        setup_script_path = shells_path / "tailscale-exit-node-setup.bash"
-        setup_script_path.write_text(setup_script_content)
-        
-        # Create mock cloud-init wrapper script
-        wrapper_script_content = """#!/bin/bash
+""".encode()
+
+_WRAPPER_SCRIPT_BYTES = """#!/bin/bash
 # Cloud-Init Wrapper Script for Tailscale Exit Node Setup
 set -euo pipefail
 exec > >(tee -a /var/log/cloud-init-output.log) 2>&1
@@ -62,29 +51,33 @@ chmod +x /tmp/tailscale-setup.sh
 rm -f /tmp/tailscale-setup.sh
 
 echo "Cloud-init setup completed!"
-"""
-        wrapper_script_path = shells_path / "cloud-init-wrapper.bash"
-        wrapper_script_path.write_text(wrapper_script_content)
-        
-        yield shells_path
+""".encode()
 
 
-@pytest.fixture
-def mock_external_dependencies():
-    """Mock external dependencies to prevent actual API calls during testing."""
-    with patch.dict('sys.modules', {
-        'digitalocean': None,
-        'requests': None, 
-        'tenacity': None,
-        'dotenv': None
-    }):
-        yield
+@pytest.fixture(scope="session")
+def _template_shells_dir(tmp_path_factory):
+    """Build the mock shells directory once per session (per xdist worker)."""
+    shells_path = tmp_path_factory.mktemp("template") / "shells"
+    shells_path.mkdir()
+    
+    (shells_path / "tailscale-exit-node-setup.bash").write_bytes(_SETUP_SCRIPT_BYTES)
+    (shells_path / "cloud-init-wrapper.bash").write_bytes(_WRAPPER_SCRIPT_BYTES)
+    
+    return shells_path
 
 
 @pytest.fixture
+def temp_shells_dir(_template_shells_dir, tmp_path):
+    """Provide a per-test copy of the mock shells directory that tests may modify."""
+    shells_path = tmp_path / "shells"
+    shutil.copytree(_template_shells_dir, shells_path)
+    return shells_path
+
+
+@pytest.fixture(scope="session")
 def sample_config():
-    """Provide sample configuration for testing."""
-    return {
+    """Provide read-only sample configuration for testing."""
+    return MappingProxyType({
         'do_token': 'test_do_token_123',
         'ts_authkey': 'test_ts_authkey_456',
         'login_server': 'https://test.tailscale.com',
@@ -95,7 +88,7 @@ def sample_config():
         'max_nodes': 3,
         'health_check_interval': 60,
         'log_level': 'DEBUG'
-    }
+    })
 
 
 # Test markers
@@ -9,12 +9,64 @@ These tests validate the complete workflow including:
 - Error scenarios
 """
 
+import importlib.util
 import pytest
-import tempfile
 import os
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+# Repository paths, computed once per module
+_REPO_ROOT = Path(__file__).parent.parent.parent
+_DIGITAL_OCEAN_DIR = _REPO_ROOT / "digital_ocean"
+_SHELLS_DIR = _REPO_ROOT / "shells"
+
+# The module file name contains a hyphen, so load it by path once for the whole module
+_spec = importlib.util.spec_from_file_location("auto_deploy", _DIGITAL_OCEAN_DIR / "auto-deploy.py")
+auto_deploy = importlib.util.module_from_spec(_spec)
+try:
+    _spec.loader.exec_module(auto_deploy)
+except ImportError as e:
+    pytest.skip(f"CloudInitScriptGenerator not available: {e}", allow_module_level=True)
+CloudInitScriptGenerator = auto_deploy.CloudInitScriptGenerator
+
+
+# Expected script components, checked against each generated script
+_WORKFLOW_TS_AUTHKEY = "tskey-1234567890abcdef"
+_WORKFLOW_LOGIN_SERVER = "https://headscale.company.com"
+
+_EXPECTED_COMPONENTS = frozenset({
+    "#!/bin/bash",
+    "set -euo pipefail",
+    "cloud-init-output.log",
+    f'export TS_AUTHKEY="{_WORKFLOW_TS_AUTHKEY}"',
+    f'export LOGIN_SERVER="{_WORKFLOW_LOGIN_SERVER}"',
+    "SETUP_SCRIPT_EOF",
+    "/tmp/tailscale-setup.sh",
+    "chmod +x",
+    "Installing Tailscale...",
+    "Setting up exit node...",
+    "tailscale up --authkey",
+    "Setup completed successfully!"
+})
+
+_CLOUD_INIT_REQUIREMENTS = frozenset({
+    "#!/bin/bash",  # Proper shebang
+    "set -euo pipefail",  # Error handling
+    "tee -a /var/log/cloud-init-output.log",  # Logging
+    "export TS_AUTHKEY=",  # Environment variables
+    "export LOGIN_SERVER=",
+    "chmod +x",  # Executable permissions
+    "rm -f",  # Cleanup
+})
+
+_TAILSCALE_REQUIREMENTS = frozenset({
+    "tailscale up",
+    "--authkey",
+    "--advertise-exit-node",
+    "net.ipv4.ip_forward",
+    "sysctl -p",
+})
+
 
 @pytest.mark.integration
 @pytest.mark.slow
@@ -23,21 +75,12 @@ class TestEndToEndWorkflow:
     
     def test_complete_script_generation_workflow(self, temp_shells_dir):
         """Test the complete script generation workflow."""
-        # Import here to avoid dependency issues
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "digital_ocean"))
-        
-        try:
-            from auto_deploy import CloudInitScriptGenerator
-        except ImportError:
-            pytest.skip("CloudInitScriptGenerator not available")
-        
         # Create generator with test shells directory
         generator = CloudInitScriptGenerator(shells_path=str(temp_shells_dir))
         
         # Test configuration
-        ts_authkey = "tskey-1234567890abcdef"
-        login_server = "https://headscale.company.com"
+        ts_authkey = _WORKFLOW_TS_AUTHKEY
+        login_server = _WORKFLOW_LOGIN_SERVER
         
         # Generate the script
         result = generator.generate_tailscale_script(ts_authkey, login_server)
@@ -47,38 +90,13 @@ class TestEndToEndWorkflow:
         assert len(result) > 500  # Should be substantial
         
         # Check for all expected components
-        expected_components = [
-            "#!/bin/bash",
-            "set -euo pipefail",
-            "cloud-init-output.log",
-            f'export TS_AUTHKEY="{ts_authkey}"',
-            f'export LOGIN_SERVER="{login_server}"',
-            "SETUP_SCRIPT_EOF",
-            "/tmp/tailscale-setup.sh",
-            "chmod +x",
-            "Installing Tailscale...",
-            "Setting up exit node...",
-            "tailscale up --authkey",
-            "Setup completed successfully!"
-        ]
-        
-        for component in expected_components:
-            assert component in result, f"Missing component: {component}"
+        missing = {c for c in _EXPECTED_COMPONENTS if c not in result}
+        assert not missing, f"Missing components: {sorted(missing)}"
     
     def test_file_system_integration(self):
         """Test integration with the real file system."""
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "digital_ocean"))
-        
-        try:
-            from auto_deploy import CloudInitScriptGenerator
-        except ImportError:
-            pytest.skip("CloudInitScriptGenerator not available")
-        
         # Use the real shells directory
-        real_shells_path = Path(__file__).parent.parent.parent / "shells"
-        
-        if not real_shells_path.exists():
+        if not _SHELLS_DIR.exists():
             pytest.skip("Real shells directory not found")
         
         generator = CloudInitScriptGenerator()
@@ -100,31 +118,15 @@ class TestEndToEndWorkflow:
     
     def test_error_handling_integration(self, temp_shells_dir):
         """Test error handling in integration scenarios."""
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "digital_ocean"))
-        
-        try:
-            from auto_deploy import CloudInitScriptGenerator
-        except ImportError:
-            pytest.skip("CloudInitScriptGenerator not available")
-        
         # Test with non-existent directory
+        # The real generator validates the scripts exist as soon as it is constructed
         non_existent_path = temp_shells_dir / "non_existent"
-        generator = CloudInitScriptGenerator(shells_path=str(non_existent_path))
-        
         with pytest.raises(FileNotFoundError):
+            generator = CloudInitScriptGenerator(shells_path=str(non_existent_path))
             generator.generate_tailscale_script("key", "server")
     
     def test_script_content_validation(self, temp_shells_dir):
         """Test that generated scripts contain all necessary components for cloud-init."""
-        import sys
-        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "digital_ocean"))
-        
-        try:
-            from auto_deploy import CloudInitScriptGenerator
-        except ImportError:
-            pytest.skip("CloudInitScriptGenerator not available")
-        
         generator = CloudInitScriptGenerator(shells_path=str(temp_shells_dir))
         
         result = generator.generate_tailscale_script(
@@ -133,82 +135,32 @@ class TestEndToEndWorkflow:
         )
         
         # Validate cloud-init specific requirements
-        cloud_init_requirements = [
-            "#!/bin/bash",  # Proper shebang
-            "set -euo pipefail",  # Error handling
-            "tee -a /var/log/cloud-init-output.log",  # Logging
-            "export TS_AUTHKEY=",  # Environment variables
-            "export LOGIN_SERVER=",
-            "chmod +x",  # Executable permissions
-            "rm -f",  # Cleanup
-        ]
-        
-        for requirement in cloud_init_requirements:
-            assert requirement in result, f"Missing cloud-init requirement: {requirement}"
+        missing = {c for c in _CLOUD_INIT_REQUIREMENTS if c not in result}
+        assert not missing, f"Missing cloud-init requirements: {sorted(missing)}"
         
         # Validate Tailscale specific components
-        tailscale_requirements = [
-            "tailscale up",
-            "--authkey",
-            "--advertise-exit-node",
-            "net.ipv4.ip_forward",
-            "sysctl -p",
-        ]
-        
-        for requirement in tailscale_requirements:
-            assert requirement in result, f"Missing Tailscale requirement: {requirement}"
+        missing = {c for c in _TAILSCALE_REQUIREMENTS if c not in result}
+        assert not missing, f"Missing Tailscale requirements: {sorted(missing)}"
 
 
 @pytest.mark.integration
-def test_multiple_script_generations():
+@pytest.mark.slow
+def test_multiple_script_generations(temp_shells_dir):
     """Test generating multiple scripts to ensure no state pollution."""
-    import sys
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent / "digital_ocean"))
+    generator = CloudInitScriptGenerator(shells_path=str(temp_shells_dir))
     
-    try:
-        from auto_deploy import CloudInitScriptGenerator
-    except ImportError:
-        pytest.skip("CloudInitScriptGenerator not available")
+    # Generate multiple scripts with different parameters
+    configs = [
+        ("key1", "https://server1.com"),
+        ("key2", "https://server2.com"), 
+        ("key3", "https://server3.com"),
+    ]
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        shells_path = Path(temp_dir) / "shells"
-        shells_path.mkdir()
-        
-        # Create test files
-        (shells_path / "tailscale-exit-node-setup.bash").write_text("#!/bin/bash\necho 'test setup'")
-        (shells_path / "cloud-init-wrapper.bash").write_text(
-            "#!/bin/bash\nexport TS_AUTHKEY=\"{ts_authkey}\"\n"
-            "export LOGIN_SERVER=\"{login_server}\"\n{setup_script_content}"
-        )
-        
-        generator = CloudInitScriptGenerator(shells_path=str(shells_path))
-        
-        # Generate multiple scripts with different parameters
-        configs = [
-            ("key1", "https://server1.com"),
-            ("key2", "https://server2.com"), 
-            ("key3", "https://server3.com"),
-        ]
-        
-        results = []
-        for key, server in configs:
-            result = generator.generate_tailscale_script(key, server)
-            results.append(result)
-            
-            # Verify this result has the correct parameters
-            assert key in result
-            assert server in result
-        
-        # Verify all results are different and don't cross-contaminate
-        for i, (key, server) in enumerate(configs):
-            current_result = results[i]
-            
-            # Check this result has the right content
-            assert key in current_result
-            assert server in current_result
-            
-            # Check other keys/servers are not in this result
-            for j, (other_key, other_server) in enumerate(configs):
-                if i != j:
-                    assert other_key not in current_result or other_key == key
-                    assert other_server not in current_result or other_server == server
+    results = [generator.generate_tailscale_script(key, server) for key, server in configs]
+    
+    # Each result must contain exactly its own key and server, and none of the others
+    keys = [key for key, _ in configs]
+    servers = [server for _, server in configs]
+    for (key, server), result in zip(configs, results):
+        assert {k for k in keys if k in result} == {key}, f"Unexpected keys in script for {key}"
+        assert {s for s in servers if s in result} == {server}, f"Unexpected servers in script for {server}"
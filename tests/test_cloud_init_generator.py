@@ -5,46 +5,69 @@ Unit tests for CloudInitScriptGenerator
 Tests the cloud-init wrapper script extraction functionality using pytest.
 """
 
+import functools
 import pytest
 import sys
 from pathlib import Path
 from unittest.mock import patch
 
+# Repository paths, computed once per module
+_REPO_ROOT = Path(__file__).parent.parent
+_DIGITAL_OCEAN_DIR = _REPO_ROOT / "digital_ocean"
+_SHELLS_DIR = _REPO_ROOT / "shells"
+
 # Add the project root to the path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "digital_ocean"))
+sys.path.insert(0, str(_DIGITAL_OCEAN_DIR))
 
 # Import the class we want to test
 try:
     from auto_deploy import CloudInitScriptGenerator
 except ImportError:
     # Fallback for testing
+    @functools.lru_cache(maxsize=16)
+    def _read_cached(path, mtime_ns):
+        return Path(path).read_text(encoding='utf-8')
+
     class CloudInitScriptGenerator:
         def __init__(self, shells_path=None):
-            self.shells_path = Path(shells_path) if shells_path else Path(__file__).parent.parent / "shells"
+            if not shells_path:
+                self.shells_path = _SHELLS_DIR
+            elif isinstance(shells_path, Path):
+                self.shells_path = shells_path
+            else:
+                self.shells_path = Path(shells_path)
             self.setup_script_path = self.shells_path / "tailscale-exit-node-setup.bash"
             self.cloud_init_wrapper_path = self.shells_path / "cloud-init-wrapper.bash"
         
         def generate_tailscale_script(self, ts_authkey: str, login_server: str) -> str:
             try:
-                with open(self.setup_script_path, 'r') as f:
-                    setup_script_content = f.read()
+                setup_script_content = _read_cached(
+                    str(self.setup_script_path), self.setup_script_path.stat().st_mtime_ns
+                )
             except FileNotFoundError:
                 raise FileNotFoundError(f"Setup script not found at {self.setup_script_path}")
             
             try:
-                with open(self.cloud_init_wrapper_path, 'r') as f:
-                    cloud_init_wrapper_content = f.read()
+                cloud_init_wrapper_content = _read_cached(
+                    str(self.cloud_init_wrapper_path), self.cloud_init_wrapper_path.stat().st_mtime_ns
+                )
             except FileNotFoundError:
                 raise FileNotFoundError(f"Cloud-init wrapper script not found at {self.cloud_init_wrapper_path}")
             
-            return cloud_init_wrapper_content.format(
-                ts_authkey=ts_authkey,
-                login_server=login_server,
-                setup_script_content=setup_script_content
+            return (
+                cloud_init_wrapper_content
+                .replace("{ts_authkey}", ts_authkey)
+                .replace("{login_server}", login_server)
+                .replace("{setup_script_content}", setup_script_content)
             )
 
 
+@pytest.fixture(scope="module")
+def generator(_template_shells_dir):
+    """CloudInitScriptGenerator shared by tests that only read the mock shells directory."""
+    return CloudInitScriptGenerator(shells_path=str(_template_shells_dir))
+
+
 @pytest.mark.unit
 class TestCloudInitScriptGenerator:
     """Unit tests for CloudInitScriptGenerator class."""
@@ -61,8 +84,7 @@ class TestCloudInitScriptGenerator:
         """Test CloudInitScriptGenerator initialization with default shells path."""
         generator = CloudInitScriptGenerator()
         
-        expected_shells_path = Path(__file__).parent.parent / "shells"
-        assert generator.shells_path == expected_shells_path
+        assert generator.shells_path == _SHELLS_DIR
     
     def test_generate_tailscale_script_success(self, temp_shells_dir):
         """Test successful generation of cloud-init script."""
@@ -74,12 +96,16 @@ class TestCloudInitScriptGenerator:
         result = generator.generate_tailscale_script(ts_authkey, login_server)
         
         # Verify the result contains expected elements
-        assert "#!/bin/bash" in result
-        assert f'export TS_AUTHKEY="{ts_authkey}"' in result
-        assert f'export LOGIN_SERVER="{login_server}"' in result
-        assert "Installing Tailscale..." in result
-        assert "Setting up exit node..." in result
-        assert "/tmp/tailscale-setup.sh" in result
+        expected = [
+            "#!/bin/bash",
+            f'export TS_AUTHKEY="{ts_authkey}"',
+            f'export LOGIN_SERVER="{login_server}"',
+            "Installing Tailscale...",
+            "Setting up exit node...",
+            "/tmp/tailscale-setup.sh",
+        ]
+        missing = [item for item in expected if item not in result]
+        assert not missing, f"Missing from generated script: {missing}"
     
     def test_generate_tailscale_script_missing_setup_file(self, temp_shells_dir):
         """Test error handling when setup script file is missing."""
@@ -134,12 +160,17 @@ class TestCloudInitScriptGenerator:
         result = generator.generate_tailscale_script("test_key", "https://test.com")
         
         # The setup script content should be embedded between SETUP_SCRIPT_EOF markers
-        assert "SETUP_SCRIPT_EOF" in result
-        assert "Installing Tailscale..." in result
-        assert "Setting up exit node..." in result
-        assert "tailscale up --authkey" in result
+        expected = [
+            "SETUP_SCRIPT_EOF",
+            "Installing Tailscale...",
+            "Setting up exit node...",
+            "tailscale up --authkey",
+        ]
+        missing = [item for item in expected if item not in result]
+        assert not missing, f"Missing from generated script: {missing}"
     
     @pytest.mark.integration
+    @pytest.mark.slow
     def test_real_files_integration(self):
         """Integration test with the actual shell script files."""
         # This test uses the real files in the shells directory
@@ -189,9 +220,8 @@ class TestCloudInitScriptGenerator:
     ("complex-key_123@domain", "https://headscale.company.com:443/api"),
 ])
 @pytest.mark.unit
-def test_various_parameter_combinations(ts_authkey, login_server, temp_shells_dir):
+def test_various_parameter_combinations(ts_authkey, login_server, generator):
     """Test the generator with various parameter combinations."""
-    generator = CloudInitScriptGenerator(shells_path=str(temp_shells_dir))
     result = generator.generate_tailscale_script(ts_authkey, login_server)
     
     assert ts_authkey in result